@@ -7,13 +7,39 @@ from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
 warnings.filterwarnings('ignore')
 
-def load_data(filename='lng_flare_data.csv'):
+# Per-cause rate columns with their display names
+CAUSE_COLS = [
+    'normal_operations_m3_per_hour',
+    'process_upset_m3_per_hour',
+    'equipment_maintenance_m3_per_hour',
+    'startup_shutdown_m3_per_hour',
+    'emergency_relief_m3_per_hour',
+    'compressor_trip_m3_per_hour',
+    'instrument_failure_m3_per_hour'
+]
+CAUSE_NAMES = ['Normal Operations', 'Process Upset', 'Equipment Maintenance', 'Startup/Shutdown',
+               'Emergency Relief', 'Compressor Trip', 'Instrument Failure']
+CAUSE_SHORT_NAMES = ['Normal Ops', 'Process Upset', 'Equip Maint', 
+                     'Startup/SD', 'Emergency', 'Compressor', 'Instrument']
+
+# Rows scanned per sheet when sizing Excel columns
+WIDTH_SAMPLE_ROWS = 50
+
+def load_data(filename='lng_flare_data.parquet'):
     """Load and prepare flare data"""
-    df = pd.read_csv(filename)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df = pd.read_parquet(filename, engine='pyarrow')
+    
+    # Rates are stored as float32; widen to float64 (restoring the two decimals) for the statistics
+    rate_cols = [col for col in df.columns if col.endswith('_m3_per_hour')]
+    df[rate_cols] = df[rate_cols].astype(np.float64).round(2)
     df['date'] = df['timestamp'].dt.date
     df['week'] = df['timestamp'].dt.isocalendar().week
     
+    # Small integer group keys (Monday=0, January=1)
+    df['hour'] = df['timestamp'].dt.hour.astype('int8')
+    df['dow_code'] = df['timestamp'].dt.dayofweek.astype('int8')
+    df['month_code'] = df['timestamp'].dt.month.astype('int8')
+    
     print(f"Data loaded successfully: {len(df):,} records")
     print(f"Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
     return df
@@ -28,7 +54,12 @@ def style_header(ws, row=1):
 
 def descriptive_statistics(df):
     """Comprehensive descriptive statistics"""
-    total_rate = df['total_flare_rate_m3_per_hour']
+    total_rate = df['total_flare_rate_m3_per_hour'].to_numpy()
+    
+    # All percentiles from a single partition of the data
+    p5, p10, p25, p50, p75, p90, p95, p99 = np.quantile(
+        total_rate, [0.05, 0.10, 0.25, 0.50, 0.75, 0.90, 0.95, 0.99]
+    )
     
     stats_dict = {
         'Metric': ['Count', 'Mean', 'Median', 'Std Dev', 'Min', 'Max', 'Range',
@@ -39,45 +70,35 @@ def descriptive_statistics(df):
         'Value': [
             len(total_rate),
             total_rate.mean(),
-            total_rate.median(),
-            total_rate.std(),
+            p50,
+            total_rate.std(ddof=1),
             total_rate.min(),
             total_rate.max(),
             total_rate.max() - total_rate.min(),
-            total_rate.quantile(0.25),
-            total_rate.quantile(0.75),
-            total_rate.quantile(0.75) - total_rate.quantile(0.25),
+            p25,
+            p75,
+            p75 - p25,
             stats.skew(total_rate),
             stats.kurtosis(total_rate),
-            total_rate.quantile(0.05),
-            total_rate.quantile(0.10),
-            total_rate.quantile(0.25),
-            total_rate.quantile(0.50),
-            total_rate.quantile(0.75),
-            total_rate.quantile(0.90),
-            total_rate.quantile(0.95),
-            total_rate.quantile(0.99),
+            p5,
+            p10,
+            p25,
+            p50,
+            p75,
+            p90,
+            p95,
+            p99,
         ]
     }
     
     return pd.DataFrame(stats_dict)
 
-def normality_tests_by_cause(df):
-    """Test for normality of distribution for each cause"""
-    cause_cols = {
-        'normal_operations_m3_per_hour': 'Normal Operations',
-        'process_upset_m3_per_hour': 'Process Upset',
-        'equipment_maintenance_m3_per_hour': 'Equipment Maintenance',
-        'startup_shutdown_m3_per_hour': 'Startup/Shutdown',
-        'emergency_relief_m3_per_hour': 'Emergency Relief',
-        'compressor_trip_m3_per_hour': 'Compressor Trip',
-        'instrument_failure_m3_per_hour': 'Instrument Failure'
-    }
-    
+def normality_tests_by_cause(cause_matrix, cause_names=CAUSE_NAMES):
+    """Test for normality of distribution for each cause (one column of cause_matrix per cause)"""
     results = []
     
-    for col, name in cause_cols.items():
-        data = df[col]
+    for k, name in enumerate(cause_names):
+        data = cause_matrix[:, k]
         active_data = data[data > 0]  # Only test active periods
         
         if len(active_data) < 3:
@@ -86,9 +107,10 @@ def normality_tests_by_cause(df):
                 'Sample Size': len(active_data),
                 'Mean (m³/hr)': 0,
                 'Std Dev': 0,
-                'Shapiro-Wilk Statistic': 'N/A',
-                'Shapiro-Wilk P-value': 'N/A',
-                'Shapiro Result': 'Insufficient Data',
+                'Normality Test': 'N/A',
+                'Normality Statistic': 'N/A',
+                'Normality P-value': 'N/A',
+                'Normality Result': 'Insufficient Data',
                 'KS Statistic': 'N/A',
                 'KS P-value': 'N/A',
                 'KS Result': 'Insufficient Data',
@@ -97,25 +119,28 @@ def normality_tests_by_cause(df):
             })
             continue
         
-        # Shapiro-Wilk test (on sample if too large)
-        sample_size = min(5000, len(active_data))
-        sample = active_data.sample(n=sample_size, random_state=42) if len(active_data) > 5000 else active_data
-        shapiro_stat, shapiro_p = stats.shapiro(sample)
+        # Shapiro-Wilk for up to 5000 points, D'Agostino-Pearson on the full series above that
+        if len(active_data) > 5000:
+            test_name = "D'Agostino-Pearson"
+            test_stat, test_p = stats.normaltest(active_data)
+        else:
+            test_name = 'Shapiro-Wilk'
+            test_stat, test_p = stats.shapiro(active_data)
         
         # Kolmogorov-Smirnov test
         ks_stat, ks_p = stats.kstest(active_data, 'norm', 
-                                      args=(active_data.mean(), active_data.std()))
+                                      args=(active_data.mean(), active_data.std(ddof=1)))
         
         # Anderson-Darling test
         anderson_result = stats.anderson(active_data, dist='norm')
         
         # Interpretation
-        shapiro_normal = shapiro_p > 0.05
+        test_normal = test_p > 0.05
         ks_normal = ks_p > 0.05
         
-        if shapiro_normal and ks_normal:
+        if test_normal and ks_normal:
             interpretation = 'Data appears normally distributed'
-        elif not shapiro_normal and not ks_normal:
+        elif not test_normal and not ks_normal:
             interpretation = 'Data is NOT normally distributed'
         else:
             interpretation = 'Mixed results - likely not normal'
@@ -124,10 +149,11 @@ def normality_tests_by_cause(df):
             'Cause': name,
             'Sample Size': len(active_data),
             'Mean (m³/hr)': round(active_data.mean(), 2),
-            'Std Dev': round(active_data.std(), 2),
-            'Shapiro-Wilk Statistic': round(shapiro_stat, 6),
-            'Shapiro-Wilk P-value': f"{shapiro_p:.6e}" if shapiro_p < 0.001 else round(shapiro_p, 6),
-            'Shapiro Result': 'Normal' if shapiro_normal else 'Not Normal',
+            'Std Dev': round(active_data.std(ddof=1), 2),
+            'Normality Test': test_name,
+            'Normality Statistic': round(test_stat, 6),
+            'Normality P-value': f"{test_p:.6e}" if test_p < 0.001 else round(test_p, 6),
+            'Normality Result': 'Normal' if test_normal else 'Not Normal',
             'KS Statistic': round(ks_stat, 6),
             'KS P-value': f"{ks_p:.6e}" if ks_p < 0.001 else round(ks_p, 6),
             'KS Result': 'Normal' if ks_normal else 'Not Normal',
@@ -140,6 +166,7 @@ def normality_tests_by_cause(df):
 def outlier_analysis(df):
     """Identify and analyze outliers"""
     total_rate = df['total_flare_rate_m3_per_hour']
+    values = total_rate.to_numpy()
     
     # IQR method
     Q1 = total_rate.quantile(0.25)
@@ -150,15 +177,14 @@ def outlier_analysis(df):
     
     iqr_outliers = df[(total_rate < lower_bound) | (total_rate > upper_bound)]
     
-    # Z-score method
-    z_scores = np.abs(stats.zscore(total_rate))
-    z_outliers = df[z_scores > 3]
+    # Z-score method (|z| > 3 tested in original units as |x - mean| > 3 * population std)
+    z_outliers = df[np.abs(values - values.mean()) > 3 * values.std()]
     
-    # Modified Z-score method
-    median = total_rate.median()
-    mad = np.median(np.abs(total_rate - median))
-    modified_z_scores = 0.6745 * (total_rate - median) / mad
-    modified_z_outliers = df[np.abs(modified_z_scores) > 3.5]
+    # Modified Z-score method (|0.6745 * (x - median) / MAD| > 3.5, tested in original units)
+    median = np.median(values)
+    abs_deviation = np.abs(values - median)
+    mad = np.median(abs_deviation)
+    modified_z_outliers = df[abs_deviation > 3.5 * mad / 0.6745]
     
     summary = pd.DataFrame({
         'Method': ['IQR (1.5× IQR)', 'Z-Score (|z| > 3)', 'Modified Z-Score (MAD, |z| > 3.5)'],
@@ -183,31 +209,18 @@ def outlier_analysis(df):
     
     return summary, top_outliers
 
-def cause_correlation_analysis(df):
+def cause_correlation_analysis(cause_matrix, short_names=CAUSE_SHORT_NAMES):
     """Analyze correlations between different causes"""
-    cause_cols = [
-        'normal_operations_m3_per_hour',
-        'process_upset_m3_per_hour',
-        'equipment_maintenance_m3_per_hour',
-        'startup_shutdown_m3_per_hour',
-        'emergency_relief_m3_per_hour',
-        'compressor_trip_m3_per_hour',
-        'instrument_failure_m3_per_hour'
-    ]
+    full_corr = np.corrcoef(cause_matrix, rowvar=False)
     
-    corr_matrix = df[cause_cols].corr().round(4)
-    
-    # Rename columns for readability
-    short_names = ['Normal Ops', 'Process Upset', 'Equip Maint', 
-                   'Startup/SD', 'Emergency', 'Compressor', 'Instrument']
-    corr_matrix.columns = short_names
-    corr_matrix.index = short_names
+    # Short names as labels for readability
+    corr_matrix = pd.DataFrame(full_corr.round(4), index=short_names, columns=short_names)
     
     # Find strongest correlations
     strong_corr = []
-    for i in range(len(cause_cols)):
-        for j in range(i+1, len(cause_cols)):
-            corr_val = df[cause_cols].corr().iloc[i, j]
+    for i in range(len(short_names)):
+        for j in range(i+1, len(short_names)):
+            corr_val = full_corr[i, j]
             if abs(corr_val) > 0.05:
                 strong_corr.append({
                     'Cause 1': short_names[i],
@@ -233,21 +246,21 @@ def temporal_analysis(df):
     hourly.index.name = 'Hour'
     hourly.columns = ['Mean (m³/hr)', 'Std Dev', 'Min', 'Max', 'Count']
     
-    # Day of week patterns
-    dow_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    daily = df.groupby('day_of_week')['total_flare_rate_m3_per_hour'].agg([
+    # Day of week patterns (grouped on integer codes, labelled afterwards)
+    dow_order = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+    daily = df.groupby('dow_code')['total_flare_rate_m3_per_hour'].agg([
         'mean', 'std', 'min', 'max', 'count'
-    ]).reindex(dow_order).round(2)
-    daily.index.name = 'Day of Week'
+    ]).reindex(range(7)).round(2)
+    daily.index = pd.Index(dow_order[daily.index], name='Day of Week')
     daily.columns = ['Mean (m³/hr)', 'Std Dev', 'Min', 'Max', 'Count']
     
     # Monthly patterns
-    month_order = ['January', 'February', 'March', 'April', 'May', 'June',
-                   'July', 'August', 'September', 'October', 'November', 'December']
-    monthly = df.groupby('month')['total_flare_rate_m3_per_hour'].agg([
+    month_order = np.array(['January', 'February', 'March', 'April', 'May', 'June',
+                            'July', 'August', 'September', 'October', 'November', 'December'])
+    monthly = df.groupby('month_code')['total_flare_rate_m3_per_hour'].agg([
         'mean', 'sum', 'std', 'min', 'max', 'count'
-    ]).reindex(month_order).round(2)
-    monthly.index.name = 'Month'
+    ]).reindex(range(1, 13)).round(2)
+    monthly.index = pd.Index(month_order[monthly.index - 1], name='Month')
     monthly.columns = ['Mean (m³/hr)', 'Total (m³)', 'Std Dev', 'Min', 'Max', 'Count']
     
     # Weekly aggregates
@@ -261,9 +274,9 @@ def temporal_analysis(df):
 
 def severity_analysis(df):
     """Analyze severity patterns"""
-    severity_stats = df.groupby('severity').agg({
-        'total_flare_rate_m3_per_hour': ['count', 'mean', 'std', 'min', 'max', 'sum']
-    }).round(2)
+    severity_stats = df.groupby('severity')['total_flare_rate_m3_per_hour'].agg([
+        'count', 'mean', 'std', 'min', 'max', 'sum'
+    ]).round(2)
     
     severity_stats.columns = ['Count', 'Mean (m³/hr)', 'Std Dev', 'Min', 'Max', 'Total (m³)']
     severity_stats['Percentage'] = (severity_stats['Count'] / len(df) * 100).round(2)
@@ -271,34 +284,38 @@ def severity_analysis(df):
     
     return severity_stats
 
-def cause_specific_statistics(df):
-    """Detailed statistics for each cause"""
-    cause_cols = {
-        'normal_operations_m3_per_hour': 'Normal Operations',
-        'process_upset_m3_per_hour': 'Process Upset',
-        'equipment_maintenance_m3_per_hour': 'Equipment Maintenance',
-        'startup_shutdown_m3_per_hour': 'Startup/Shutdown',
-        'emergency_relief_m3_per_hour': 'Emergency Relief',
-        'compressor_trip_m3_per_hour': 'Compressor Trip',
-        'instrument_failure_m3_per_hour': 'Instrument Failure'
-    }
-    
-    results = []
-    for col, name in cause_cols.items():
-        data = df[col]
-        active = data[data > 0]
-        
-        results.append({
-            'Cause': name,
-            'Total Volume (m³)': round(data.sum(), 2),
-            'Active Hours': len(active),
-            'Active %': f"{len(active)/len(df)*100:.2f}%",
-            'Mean Active (m³/hr)': round(active.mean(), 2) if len(active) > 0 else 0,
-            'Std Dev Active': round(active.std(), 2) if len(active) > 0 else 0,
-            'Max Rate (m³/hr)': round(active.max(), 2) if len(active) > 0 else 0
-        })
-    
-    return pd.DataFrame(results)
+def cause_specific_statistics(cause_matrix, cause_names=CAUSE_NAMES):
+    """Detailed statistics for each cause (one column of cause_matrix per cause)"""
+    n_hours = len(cause_matrix)
+    
+    # Whole-matrix reductions over the active (non-zero) hours of every cause at once
+    active_mask = cause_matrix > 0
+    active_hours = active_mask.sum(axis=0)
+    has_active = active_hours > 0
+    active_values = np.where(active_mask, cause_matrix, 0)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_active = active_values.sum(axis=0) / np.maximum(active_hours, 1)
+        squared_dev = np.where(active_mask, cause_matrix - mean_active, 0) ** 2
+        std_active = np.sqrt(squared_dev.sum(axis=0) / (active_hours - 1))
+    
+    return pd.DataFrame({
+        'Cause': cause_names,
+        'Total Volume (m³)': cause_matrix.sum(axis=0).round(2),
+        'Active Hours': active_hours,
+        'Active %': [f"{pct:.2f}%" for pct in active_hours / n_hours * 100],
+        'Mean Active (m³/hr)': np.where(has_active, mean_active, 0).round(2),
+        'Std Dev Active': np.where(has_active, std_active, 0).round(2),
+        'Max Rate (m³/hr)': np.where(has_active, active_values.max(axis=0), 0).round(2)
+    })
+
+def moving_average_stats(values, window):
+    """Min, max and mean of the full-window moving averages, rounded to 2 decimals (NaN if there is no full window)"""
+    # np.convolve swaps its arguments when the window is the longer one, so guard short inputs
+    if len(values) < window:
+        return np.nan, np.nan, np.nan
+    moving_avg = np.convolve(values, np.ones(window) / window, mode='valid')
+    return round(moving_avg.min(), 2), round(moving_avg.max(), 2), round(moving_avg.mean(), 2)
 
 def trend_analysis(df):
     """Analyze long-term trends"""
@@ -323,25 +340,16 @@ def trend_analysis(df):
         ]
     })
     
-    # Moving averages
-    df_sorted = df.sort_values('timestamp').copy()
-    df_sorted['MA_24h'] = df_sorted['total_flare_rate_m3_per_hour'].rolling(window=24).mean()
-    df_sorted['MA_168h'] = df_sorted['total_flare_rate_m3_per_hour'].rolling(window=168).mean()
+    # Moving averages (full windows only) over the time-ordered rates
+    rates = df.sort_values('timestamp')['total_flare_rate_m3_per_hour'].to_numpy()
+    ma_24h = moving_average_stats(rates, 24)
+    ma_168h = moving_average_stats(rates, 168)
     
     ma_summary = pd.DataFrame({
         'Moving Average': ['24-hour MA', '7-day MA (168h)'],
-        'Min (m³/hr)': [
-            round(df_sorted['MA_24h'].min(), 2),
-            round(df_sorted['MA_168h'].min(), 2)
-        ],
-        'Max (m³/hr)': [
-            round(df_sorted['MA_24h'].max(), 2),
-            round(df_sorted['MA_168h'].max(), 2)
-        ],
-        'Mean (m³/hr)': [
-            round(df_sorted['MA_24h'].mean(), 2),
-            round(df_sorted['MA_168h'].mean(), 2)
-        ]
+        'Min (m³/hr)': [ma_24h[0], ma_168h[0]],
+        'Max (m³/hr)': [ma_24h[1], ma_168h[1]],
+        'Mean (m³/hr)': [ma_24h[2], ma_168h[2]]
     })
     
     return trend_summary, ma_summary
@@ -375,6 +383,9 @@ def main():
     print("Loading data...")
     df = load_data()
     
+    # Shared (hours x causes) matrix for the cause-wise analyses
+    cause_matrix = np.ascontiguousarray(df[CAUSE_COLS].to_numpy(dtype=np.float64))
+    
     print("\nRunning analyses...")
     
     # Create Excel writer
@@ -404,7 +415,7 @@ def main():
         
         # 3. Normality Tests (by cause)
         print("  - Running normality tests by cause...")
-        normality_df = normality_tests_by_cause(df)
+        normality_df = normality_tests_by_cause(cause_matrix)
         normality_df.to_excel(writer, sheet_name='Normality Tests', index=False)
         
         # 4. Outlier Analysis
@@ -416,7 +427,7 @@ def main():
         
         # 5. Correlation Analysis
         print("  - Calculating correlations...")
-        corr_matrix, strong_corr = cause_correlation_analysis(df)
+        corr_matrix, strong_corr = cause_correlation_analysis(cause_matrix)
         corr_matrix.to_excel(writer, sheet_name='Correlations', startrow=0)
         if not strong_corr.empty:
             strong_corr.to_excel(writer, sheet_name='Correlations', index=False, startrow=len(corr_matrix)+3)
@@ -436,7 +447,7 @@ def main():
         
         # 8. Cause-Specific Statistics
         print("  - Calculating cause-specific statistics...")
-        cause_stats = cause_specific_statistics(df)
+        cause_stats = cause_specific_statistics(cause_matrix)
         cause_stats.to_excel(writer, sheet_name='Cause Statistics', index=False)
         
         # 9. Dominant Cause Analysis
@@ -457,16 +468,9 @@ def main():
             ws = writer.sheets[sheet_name]
             style_header(ws)
             
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column = [cell for cell in column]
-                for cell in column:
-                    try:
-                        if cell.value and len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
+            # Auto-adjust column widths from the header and the first rows only
+            for column in ws.iter_cols(max_row=min(ws.max_row, WIDTH_SAMPLE_ROWS)):
+                max_length = max((len(str(cell.value)) for cell in column if cell.value), default=0)
                 adjusted_width = min(max_length + 2, 50)
                 ws.column_dimensions[column[0].column_letter].width = adjusted_width
     
@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import random
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 # Set random seed for reproducibility
 np.random.seed(42)
@@ -19,6 +21,35 @@ FLARE_CAUSES = {
     'instrument_failure': {'avg_rate': 60, 'std': 20, 'probability': 0.02}
 }
 
+# Severity levels in increasing order: low (<= 200), medium (<= 350), high
+SEVERITY_LEVELS = ['low', 'medium', 'high']
+
+# Calendar labels indexed by dayofweek (Monday=0) and month - 1
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+
+def bounded_random_walk(steps, start, lower, upper):
+    """Accumulate steps from a starting value, clipping to [lower, upper] after each step"""
+    # Each step is the map x -> clip(x + step, low, high), and composing two such maps
+    # gives another one, so all running compositions come from a log2(N)-round prefix scan
+    shift = np.array(steps, dtype=np.float64)
+    low = np.full(len(shift), float(lower))
+    high = np.full(len(shift), float(upper))
+    
+    offset = 1
+    while offset < len(shift):
+        later = slice(offset, None)
+        earlier = slice(None, -offset)
+        shift[later], low[later], high[later] = (
+            shift[earlier] + shift[later],
+            np.clip(low[earlier] + shift[later], low[later], high[later]),
+            np.clip(high[earlier] + shift[later], low[later], high[later])
+        )
+        offset *= 2
+    
+    return np.clip(start + shift, low, high)
+
 def generate_flare_data(year=2024):
     """Generate hourly flare gas data with multi-cause contributions"""
     
@@ -26,9 +57,12 @@ def generate_flare_data(year=2024):
     start_date = datetime(year, 1, 1, 0, 0, 0)
     end_date = datetime(year, 12, 31, 23, 0, 0)
     date_range = pd.date_range(start=start_date, end=end_date, freq='h')
+    n_hours = len(date_range)
+    hours = np.asarray(date_range.hour)
+    months = np.asarray(date_range.month)
     
     # Schedule exactly 4 startup/shutdown events throughout the year
-    shutdown_events = []
+    shutdown_blocks = []
     shutdown_dates = [
         datetime(year, 2, 15),   # Mid-February
         datetime(year, 4, 20),   # Spring turnaround
@@ -39,96 +73,75 @@ def generate_flare_data(year=2024):
     for shutdown_date in shutdown_dates:
         duration_hours = random.randint(24, 72)
         shutdown_start = shutdown_date + timedelta(hours=random.randint(0, 23))
-        for h in range(duration_hours):
-            shutdown_events.append(shutdown_start + timedelta(hours=h))
-    
-    data = []
-    
-    # Initialize baseline for smooth transitions
-    baseline_rate = 100
-    
-    for i, dt in enumerate(date_range):
-        # Check if current time is during a scheduled shutdown
-        is_shutdown = dt in shutdown_events
-        
-        # Initialize contributions for each cause
-        contributions = {
-            'normal_operations': 0,
-            'process_upset': 0,
-            'equipment_maintenance': 0,
-            'startup_shutdown': 0,
-            'emergency_relief': 0,
-            'compressor_trip': 0,
-            'instrument_failure': 0
-        }
-        
-        # Normal operations - always present as baseline
-        baseline_rate += np.random.normal(0, 0.5)
-        baseline_rate = np.clip(baseline_rate, 80, 120)
-        contributions['normal_operations'] = max(0, baseline_rate + np.random.normal(0, FLARE_CAUSES['normal_operations']['std']))
-        
-        # Add time-based variation to baseline
-        hour = dt.hour
-        if 0 <= hour < 6:
-            contributions['normal_operations'] *= 0.95
-        elif 8 <= hour < 16:
-            contributions['normal_operations'] *= 1.02
-        
-        # Seasonal variation
-        month = dt.month
-        if 6 <= month <= 8:
-            contributions['normal_operations'] *= 1.05
-        
-        # Handle shutdown events
-        if is_shutdown:
-            shutdown_rate = np.random.normal(
-                FLARE_CAUSES['startup_shutdown']['avg_rate'],
-                FLARE_CAUSES['startup_shutdown']['std']
-            )
-            contributions['startup_shutdown'] = max(0, shutdown_rate)
-        
-        # Other causes occur probabilistically (not during shutdowns)
-        if not is_shutdown:
-            for cause in ['process_upset', 'equipment_maintenance', 'emergency_relief', 
-                         'compressor_trip', 'instrument_failure']:
-                if random.random() < FLARE_CAUSES[cause]['probability']:
-                    rate = np.random.normal(
-                        FLARE_CAUSES[cause]['avg_rate'],
-                        FLARE_CAUSES[cause]['std']
-                    )
-                    contributions[cause] = max(0, rate)
-        
-        # Calculate total flare rate
-        total_flare_rate = sum(contributions.values())
-        
-        # Determine severity and dominant cause
-        severity = 'low'
-        if total_flare_rate > 350:
-            severity = 'high'
-        elif total_flare_rate > 200:
-            severity = 'medium'
-        
-        # Find dominant cause
-        dominant_cause = max(contributions.items(), key=lambda x: x[1])[0]
-        
-        data.append({
-            'timestamp': dt,
-            'total_flare_rate_m3_per_hour': round(total_flare_rate, 2),
-            'normal_operations_m3_per_hour': round(contributions['normal_operations'], 2),
-            'process_upset_m3_per_hour': round(contributions['process_upset'], 2),
-            'equipment_maintenance_m3_per_hour': round(contributions['equipment_maintenance'], 2),
-            'startup_shutdown_m3_per_hour': round(contributions['startup_shutdown'], 2),
-            'emergency_relief_m3_per_hour': round(contributions['emergency_relief'], 2),
-            'compressor_trip_m3_per_hour': round(contributions['compressor_trip'], 2),
-            'instrument_failure_m3_per_hour': round(contributions['instrument_failure'], 2),
-            'dominant_cause': dominant_cause,
-            'severity': severity,
-            'day_of_week': dt.strftime('%A'),
-            'month': dt.strftime('%B'),
-            'hour': dt.hour
-        })
-    
-    return pd.DataFrame(data)
+        shutdown_blocks.append(
+            pd.date_range(start=shutdown_start, periods=duration_hours, freq='h').values
+        )
+    
+    # Flag every hour that falls within a scheduled shutdown
+    is_shutdown = np.isin(date_range.values, np.concatenate(shutdown_blocks))
+    
+    contributions = {}
+    
+    # Normal operations - always present as baseline (random walk kept within 80-120)
+    baseline = bounded_random_walk(np.random.normal(0, 0.5, n_hours), 100, 80, 120)
+    normal_ops = np.maximum(0, baseline + np.random.normal(0, FLARE_CAUSES['normal_operations']['std'], n_hours))
+    
+    # Add time-based variation to baseline
+    normal_ops *= np.where(hours < 6, 0.95, np.where((hours >= 8) & (hours < 16), 1.02, 1.0))
+    
+    # Seasonal variation
+    normal_ops *= np.where((months >= 6) & (months <= 8), 1.05, 1.0)
+    contributions['normal_operations'] = normal_ops
+    
+    # Handle shutdown events
+    shutdown_rate = np.random.normal(
+        FLARE_CAUSES['startup_shutdown']['avg_rate'],
+        FLARE_CAUSES['startup_shutdown']['std'],
+        n_hours
+    )
+    contributions['startup_shutdown'] = np.where(is_shutdown, np.maximum(0, shutdown_rate), 0)
+    
+    # Other causes occur probabilistically (not during shutdowns)
+    for cause in ['process_upset', 'equipment_maintenance', 'emergency_relief', 
+                 'compressor_trip', 'instrument_failure']:
+        occurs = (np.random.random(n_hours) < FLARE_CAUSES[cause]['probability']) & ~is_shutdown
+        rate = np.random.normal(
+            FLARE_CAUSES[cause]['avg_rate'],
+            FLARE_CAUSES[cause]['std'],
+            n_hours
+        )
+        contributions[cause] = np.where(occurs, np.maximum(0, rate), 0)
+    
+    # Stack contributions into an (hours x causes) matrix in FLARE_CAUSES order
+    cause_names = list(FLARE_CAUSES)
+    contribution_matrix = np.column_stack([contributions[cause] for cause in cause_names])
+    
+    # Calculate total flare rate
+    total_flare_rate = contribution_matrix.sum(axis=1)
+    
+    # Determine severity and dominant cause
+    severity_codes = (total_flare_rate > 200).astype(np.int8) + (total_flare_rate > 350)
+    dominant_idx = contribution_matrix.argmax(axis=1)
+    
+    data = {
+        'timestamp': date_range,
+        'total_flare_rate_m3_per_hour': total_flare_rate
+    }
+    for cause in cause_names:
+        data[f'{cause}_m3_per_hour'] = contributions[cause]
+    data['dominant_cause'] = pd.Categorical.from_codes(dominant_idx, categories=cause_names)
+    data['severity'] = pd.Categorical.from_codes(severity_codes, categories=SEVERITY_LEVELS, ordered=True)
+    data['day_of_week'] = pd.Categorical.from_codes(date_range.dayofweek, categories=DAYS_OF_WEEK, ordered=True)
+    data['month'] = pd.Categorical.from_codes(months - 1, categories=MONTH_NAMES, ordered=True)
+    data['hour'] = hours.astype(np.int8)
+    
+    df = pd.DataFrame(data)
+    
+    # Round all rate columns in a single pass; two decimals fit comfortably in float32
+    rate_cols = [col for col in df.columns if col.endswith('_m3_per_hour')]
+    df[rate_cols] = df[rate_cols].round(2).astype(np.float32)
+    
+    return df
 
 def generate_summary_statistics(df):
     """Generate summary statistics for the flare data"""
@@ -143,6 +156,9 @@ def generate_summary_statistics(df):
         'instrument_failure_m3_per_hour'
     ]
     
+    # Accumulate in float64 so yearly totals keep their two decimals
+    df = df.astype({col: np.float64 for col in ['total_flare_rate_m3_per_hour'] + cause_columns})
+    
     print("=" * 70)
     print("LNG FLARE GAS ANNUAL SUMMARY")
     print("=" * 70)
@@ -197,16 +213,21 @@ flare_df = generate_flare_data(2024)
 # Display summary statistics
 generate_summary_statistics(flare_df)
 
-# Save to CSV
+# Save to CSV, plus a typed Parquet copy for the analysis script
 output_file = 'lng_flare_data.csv'
-flare_df.to_csv(output_file, index=False)
-print(f"\n✓ Data saved to '{output_file}'")
+csv_table = pa.Table.from_pandas(flare_df, preserve_index=False)
+# Hourly timestamps need no sub-second digits in the CSV
+csv_table = csv_table.set_column(0, 'timestamp', csv_table['timestamp'].cast(pa.timestamp('s')))
+pacsv.write_csv(csv_table, output_file, pacsv.WriteOptions(quoting_style='none'))
+parquet_file = 'lng_flare_data.parquet'
+flare_df.to_parquet(parquet_file, engine='pyarrow', compression='snappy', index=False)
+print(f"\n✓ Data saved to '{output_file}' and '{parquet_file}'")
 
 # Display sample of the data
 print("\n" + "=" * 70)
 print("SAMPLE DATA (First 10 rows)")
 print("=" * 70)
-print(flare_df.head(10).to_string(index=False))
+print(flare_df.head(10).to_string(index=False, float_format='{:.2f}'.format))
 
 print("\n" + "=" * 70)
 print("HIGH SEVERITY EVENTS (Sample)")
@@ -214,4 +235,4 @@ print("=" * 70)
 high_severity = flare_df[flare_df['severity'] == 'high'].head(5)
 print(high_severity[['timestamp', 'total_flare_rate_m3_per_hour', 'startup_shutdown_m3_per_hour', 
                       'compressor_trip_m3_per_hour', 'emergency_relief_m3_per_hour', 
-                      'dominant_cause', 'severity']].to_string(index=False))
\ No newline at end of file
+                      'dominant_cause', 'severity']].to_string(index=False, float_format='{:.2f}'.format))
\ No newline at end of file
@@ -1,73 +1,20 @@
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Render straight to PNG files, no interactive windows
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
 # Set style for better-looking plots
 sns.set_style("whitegrid")
+# Lay figures out as part of each draw instead of a separate tight_layout pass per plot
+plt.rcParams['figure.constrained_layout.use'] = True
 
-# Load the data
-print("Loading flare gas data...")
-df = pd.read_csv('lng_flare_data.csv')
-df['timestamp'] = pd.to_datetime(df['timestamp'])
-
-# 1. Time Series - Full Year Overview
-plt.figure(figsize=(15, 6))
-plt.plot(df['timestamp'], df['total_flare_rate_m3_per_hour'], linewidth=0.5, alpha=0.7, color='#e74c3c')
-plt.title('Flare Gas Rate - Full Year 2024', fontsize=14, fontweight='bold')
-plt.xlabel('Date')
-plt.ylabel('Flare Rate (m³/hr)')
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('plot1_full_year_overview.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# 2. Daily Average Flare Rate
-plt.figure(figsize=(15, 6))
-daily_avg = df.groupby(df['timestamp'].dt.date)['total_flare_rate_m3_per_hour'].mean()
-plt.plot(daily_avg.index, daily_avg.values, linewidth=2, color='#3498db')
-plt.fill_between(daily_avg.index, daily_avg.values, alpha=0.3, color='#3498db')
-plt.title('Daily Average Flare Rate', fontsize=14, fontweight='bold')
-plt.xlabel('Date')
-plt.ylabel('Avg Flare Rate (m³/hr)')
-plt.grid(True, alpha=0.3)
-plt.xticks(rotation=45)
-plt.tight_layout()
-plt.savefig('plot2_daily_average.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# 3. Flare Rate by Hour of Day
-plt.figure(figsize=(12, 6))
-hourly_avg = df.groupby('hour')['total_flare_rate_m3_per_hour'].mean()
-plt.bar(hourly_avg.index, hourly_avg.values, color='#2ecc71', alpha=0.7, edgecolor='black')
-plt.title('Average Flare Rate by Hour of Day', fontsize=14, fontweight='bold')
-plt.xlabel('Hour of Day')
-plt.ylabel('Avg Flare Rate (m³/hr)')
-plt.xticks(range(0, 24, 2))
-plt.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.savefig('plot3_hourly_pattern.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# 4. Monthly Total Flare Gas
-plt.figure(figsize=(12, 6))
-df['month_num'] = df['timestamp'].dt.month
-monthly_total = df.groupby('month_num')['total_flare_rate_m3_per_hour'].sum() / 1000  # Convert to thousands
-month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-colors = plt.cm.viridis(np.linspace(0, 1, 12))
-plt.bar(range(1, 13), monthly_total.values, color=colors, edgecolor='black')
-plt.title('Monthly Total Flare Gas', fontsize=14, fontweight='bold')
-plt.xlabel('Month')
-plt.ylabel('Total Flare Gas (1000 m³)')
-plt.xticks(range(1, 13), month_names)
-plt.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.savefig('plot4_monthly_totals.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# 5. Flare Rate by Cause (using individual cause columns)
-plt.figure(figsize=(12, 7))
-cause_columns = [
+CAUSE_COLUMNS = [
     'normal_operations_m3_per_hour',
     'process_upset_m3_per_hour',
     'equipment_maintenance_m3_per_hour',
@@ -76,96 +23,296 @@ cause_columns = [
     'compressor_trip_m3_per_hour',
     'instrument_failure_m3_per_hour'
 ]
+# Bar labels and colors, in CAUSE_COLUMNS order
+CAUSE_LABELS = np.array([col.replace('_m3_per_hour', '').replace('_', ' ').title() for col in CAUSE_COLUMNS])
+CAUSE_COLORS = np.array(['#95a5a6', '#e67e22', '#9b59b6', '#f39c12', '#e74c3c', '#c0392b', '#d35400'])
+SEVERITY_LEVELS = ['low', 'medium', 'high']
+SEVERITY_COLORS = np.array(['#2ecc71', '#f39c12', '#e74c3c'])  # Indexed by severity code
 
-cause_totals = {col.replace('_m3_per_hour', ''): df[col].sum() for col in cause_columns}
-cause_data = pd.Series(cause_totals).sort_values(ascending=True)
-
-cause_colors = {
-    'normal_operations': '#95a5a6', 
-    'process_upset': '#e67e22', 
-    'equipment_maintenance': '#9b59b6', 
-    'startup_shutdown': '#f39c12',
-    'emergency_relief': '#e74c3c', 
-    'compressor_trip': '#c0392b',
-    'instrument_failure': '#d35400'
-}
-
-colors_list = [cause_colors.get(cause, '#34495e') for cause in cause_data.index]
-plt.barh(range(len(cause_data)), cause_data.values / 1000, color=colors_list, edgecolor='black')
-plt.yticks(range(len(cause_data)), [c.replace('_', ' ').title() for c in cause_data.index])
-plt.title('Total Flare Gas by Cause', fontsize=14, fontweight='bold')
-plt.xlabel('Total Flare Gas (1000 m³)')
-plt.grid(True, alpha=0.3, axis='x')
-plt.tight_layout()
-plt.savefig('plot5_flare_by_cause.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# 6. Stacked Area Chart showing contribution by cause over time
-plt.figure(figsize=(15, 7))
-# Resample to daily for cleaner visualization
-daily_data = df.set_index('timestamp')[cause_columns].resample('D').sum()
-
-plt.stackplot(daily_data.index, 
-              daily_data['normal_operations_m3_per_hour'],
-              daily_data['process_upset_m3_per_hour'],
-              daily_data['equipment_maintenance_m3_per_hour'],
-              daily_data['startup_shutdown_m3_per_hour'],
-              daily_data['emergency_relief_m3_per_hour'],
-              daily_data['compressor_trip_m3_per_hour'],
-              daily_data['instrument_failure_m3_per_hour'],
-              labels=['Normal Operations', 'Process Upset', 'Equipment Maintenance', 'Startup/Shutdown', 'Emergency Relief', 'Compressor Trip', 'Instrument Failure'],
-              colors=['#95a5a6', '#e67e22', '#9b59b6', '#f39c12', '#e74c3c', '#c0392b', '#d35400'],
-              alpha=0.8)
-
-plt.title('Daily Flare Gas Contribution by Cause', fontsize=14, fontweight='bold')
-plt.xlabel('Date')
-plt.ylabel('Daily Total Flare Gas (m³)')
-plt.legend(loc='upper left', fontsize=9)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('plot6_stacked_causes.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-# 7. BONUS: Severity Distribution
-plt.figure(figsize=(10, 6))
-severity_counts = df['severity'].value_counts()
-severity_colors = {'low': '#2ecc71', 'medium': '#f39c12', 'high': '#e74c3c'}
-colors_severity = [severity_colors[sev] for sev in severity_counts.index]
-
-plt.bar(severity_counts.index, severity_counts.values, color=colors_severity, edgecolor='black', alpha=0.8)
-plt.title('Distribution of Flare Events by Severity', fontsize=14, fontweight='bold')
-plt.xlabel('Severity Level')
-plt.ylabel('Number of Hours')
-plt.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.savefig('plot7_severity_distribution.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-plt.figure(figsize=(12, 6))
-
-# Filter out zero values for better visualization
-normal_ops_data = df[df['normal_operations_m3_per_hour'] > 0]['normal_operations_m3_per_hour']
-
-# 8. Create histogram with KDE overlay
-plt.hist(normal_ops_data, bins=50, color='#3498db', alpha=0.6, edgecolor='black', density=True, label='Histogram')
-normal_ops_data.plot(kind='kde', color='#e74c3c', linewidth=2, label='KDE')
-
-plt.title('Distribution of Normal Operations Flare Rate', fontsize=14, fontweight='bold')
-plt.xlabel('Flare Rate (m³/hr)')
-plt.ylabel('Density')
-plt.legend()
-plt.grid(True, alpha=0.3, axis='y')
-
-# Add statistics text box
-stats_text = f'Mean: {normal_ops_data.mean():.1f} m³/hr\nMedian: {normal_ops_data.median():.1f} m³/hr\nStd Dev: {normal_ops_data.std():.1f} m³/hr'
-plt.text(0.98, 0.97, stats_text, transform=plt.gca().transAxes, 
-         fontsize=10, verticalalignment='top', horizontalalignment='right',
-         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-
-plt.tight_layout()
-plt.savefig('plot8_normal_ops_distribution.png', dpi=300, bbox_inches='tight')
-plt.show()
-
-print("\nAll plots have been generated and saved successfully!")
-print("Total plots created: 8")
+# Bump whenever compute_aggregates changes what it returns, so older caches are recomputed
+AGGREGATES_VERSION = 3
 
+def fft_kde(values, grid_min, grid_max, n_grid=512):
+    """Gaussian KDE on a regular grid, computed by binning the data and FFT-convolving with the kernel"""
+    grid, step = np.linspace(grid_min, grid_max, n_grid, retstep=True)
+    counts, _ = np.histogram(values, bins=n_grid, range=(grid_min - step / 2, grid_max + step / 2))
+
+    # Scott's rule, the same bandwidth gaussian_kde (and so Series.plot(kind='kde')) uses
+    bandwidth = values.std(ddof=1) * len(values) ** (-1 / 5)
+    half_width = min(int(np.ceil(4 * bandwidth / step)), n_grid)
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+
+    # Zero-padded so the circular convolution does not wrap around
+    n_fft = 1 << int(np.ceil(np.log2(n_grid + len(kernel) - 1)))
+    smoothed = np.fft.irfft(np.fft.rfft(counts, n_fft) * np.fft.rfft(kernel, n_fft), n_fft)
+    density = smoothed[half_width:half_width + n_grid] / len(values)
+    return grid, np.maximum(density, 0)
+
+def m4_indices(values, n_buckets):
+    """Indices of the first, last, min and max sample in each of n_buckets equal-width buckets (M4 downsampling)"""
+    # Only pixel-exact when every bucket falls inside one pixel column, so n_buckets must be at least
+    # the number of output pixel columns the line spans; more buckets are always safe
+    edges = np.unique(np.linspace(0, len(values), n_buckets + 1).astype(np.intp))
+    bucket = np.repeat(np.arange(len(edges) - 1), np.diff(edges))
+    # Sort by value within each bucket, so each bucket's min and max sit at its ends
+    order = np.lexsort((values, bucket))
+    first, last = edges[:-1], edges[1:] - 1
+    return np.unique(np.concatenate([first, last, order[first], order[last]]))
+
+# Each process reuses a single figure for every plot it draws
+figure = None
+
+def start_plot(width, height):
+    """Clear the shared figure and resize it for the next plot"""
+    global figure
+    if figure is None:
+        figure = plt.figure()
+    figure.clf()
+    figure.set_size_inches(width, height)
+
+def refresh_parquet():
+    """Convert the CSV to Parquet when there is no Parquet copy yet or the CSV is newer"""
+    if os.path.exists('lng_flare_data.parquet') and (
+            not os.path.exists('lng_flare_data.csv')
+            or os.path.getmtime('lng_flare_data.csv') <= os.path.getmtime('lng_flare_data.parquet')):
+        return
+    pd.read_csv(
+        'lng_flare_data.csv', engine='pyarrow', parse_dates=['timestamp'],
+        dtype={'severity': pd.CategoricalDtype(SEVERITY_LEVELS, ordered=True), 'dominant_cause': 'category',
+               'day_of_week': 'category', 'month': 'category', 'hour': 'int8'}
+    ).to_parquet(
+        'lng_flare_data.parquet', engine='pyarrow', compression='zstd', index=False
+    )
+
+def load_data():
+    """Load the plotted columns from the Parquet copy of the current flare data"""
+    refresh_parquet()
+    df = pd.read_parquet(
+        'lng_flare_data.parquet', engine='pyarrow', dtype_backend='pyarrow',
+        columns=['timestamp', 'hour', 'severity', 'total_flare_rate_m3_per_hour'] + CAUSE_COLUMNS
+    )
+
+    # Single precision is plenty for plotting and halves the bytes every reduction below reads
+    df = df.astype({col: 'float32[pyarrow]' for col in ['total_flare_rate_m3_per_hour'] + CAUSE_COLUMNS})
+    df['severity'] = df['severity'].astype(pd.CategoricalDtype(SEVERITY_LEVELS, ordered=True))
+
+    if not df['timestamp'].is_monotonic_increasing:
+        df = df.sort_values('timestamp', ignore_index=True)
+    return df
+
+def compute_aggregates(df):
+    """Reduce the hourly data to the small arrays each plot needs"""
+    # Aggregate everything per day in one streaming pass; the daily, monthly and per-cause views
+    # used by plots 2, 4, 5 and 6 are all sliced from this small table. Rows are in time order,
+    # so every day is a contiguous block of the rate matrix and np.add.reduceat sums all blocks
+    # of all columns at once
+    rate_matrix = df[['total_flare_rate_m3_per_hour'] + CAUSE_COLUMNS].to_numpy(dtype=np.float32)
+    day_key = df['timestamp'].to_numpy().astype('datetime64[D]')
+    day_starts = np.flatnonzero(np.r_[True, day_key[1:] != day_key[:-1]])
+    daily = pd.DataFrame(
+        np.add.reduceat(rate_matrix, day_starts, axis=0),
+        index=pd.DatetimeIndex(day_key[day_starts]),
+        columns=['total_flare'] + CAUSE_COLUMNS
+    )
+    daily['hours'] = np.diff(np.r_[day_starts, len(df)])
+
+    # Plot 1 only needs the M4 points at its output resolution. One bucket per pixel column of the
+    # whole 15 in figure at 300 dpi is at least as many as its axes span under any layout
+    keep = m4_indices(rate_matrix[:, 0], 15 * 300)
+
+    # Plot 8 only needs the histogram, the KDE curve and three statistics of the nonzero normal rates
+    normal_ops = df['normal_operations_m3_per_hour'].to_numpy(dtype=np.float64)
+    normal_ops = normal_ops[normal_ops > 0]  # Filter out zero values for better visualization
+    data_range = normal_ops.max() - normal_ops.min()
+
+    month_key = daily.index.to_numpy().astype('datetime64[M]').astype(np.int16) % 12 + 1  # 1-12, no per-element accessor
+
+    return {
+        'timestamp': df['timestamp'].to_numpy()[keep],
+        'total_flare': rate_matrix[keep, 0],
+        'daily': daily,
+        'hourly_avg': df.groupby('hour')['total_flare_rate_m3_per_hour'].mean(),
+        'monthly_total': daily['total_flare'].groupby(month_key).sum() / 1000,  # Convert to thousands
+        'cause_totals': daily[CAUSE_COLUMNS].to_numpy().sum(axis=0),
+        'severity_counts': np.bincount(df['severity'].cat.codes.to_numpy(), minlength=len(SEVERITY_LEVELS)),
+        'normal_ops_histogram': np.histogram(normal_ops, bins=50),
+        'normal_ops_kde': fft_kde(normal_ops, normal_ops.min() - 0.5 * data_range, normal_ops.max() + 0.5 * data_range),
+        'normal_ops_stats': (normal_ops.mean(), np.median(normal_ops), normal_ops.std(ddof=1))
+    }
+
+def load_aggregates(cache_file='lng_flare_plot_cache.pkl'):
+    """Return the plot aggregates, recomputing them only when the flare data or their format has changed"""
+    refresh_parquet()
+    cache_key = (AGGREGATES_VERSION, os.path.getmtime('lng_flare_data.parquet'))
+    # A truncated file or one pickled by an incompatible pandas/pyarrow is just a cache miss
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_key, agg = pickle.load(f)
+        if cached_key == cache_key:
+            return agg
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError, TypeError):
+        pass
+
+    agg = compute_aggregates(load_data())
+    # Write beside the cache and swap it in, so an interrupted run never leaves half a file behind
+    fd, tmp_file = tempfile.mkstemp(prefix=os.path.basename(cache_file) + '.', suffix='.tmp',
+                                    dir=os.path.dirname(os.path.abspath(cache_file)))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((cache_key, agg), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+    return agg
+
+def plot_full_year(agg):
+    """1. Time Series - Full Year Overview"""
+    start_plot(15, 6)
+    plt.plot(agg['timestamp'], agg['total_flare'], linewidth=0.5, alpha=0.7, color='#e74c3c', rasterized=True)
+    plt.title('Flare Gas Rate - Full Year 2024', fontsize=14, fontweight='bold')
+    plt.xlabel('Date')
+    plt.ylabel('Flare Rate (m³/hr)')
+    plt.grid(True, alpha=0.3)
+    plt.savefig('plot1_full_year_overview.png', dpi=300)
+
+def plot_daily_average(agg):
+    """2. Daily Average Flare Rate"""
+    start_plot(15, 6)
+    daily = agg['daily']
+    daily_avg = daily['total_flare'] / daily['hours']
+    plt.plot(daily_avg.index, daily_avg.values, linewidth=2, color='#3498db')
+    plt.fill_between(daily_avg.index, daily_avg.values, alpha=0.3, color='#3498db')
+    plt.title('Daily Average Flare Rate', fontsize=14, fontweight='bold')
+    plt.xlabel('Date')
+    plt.ylabel('Avg Flare Rate (m³/hr)')
+    plt.grid(True, alpha=0.3)
+    plt.xticks(rotation=45)
+    plt.savefig('plot2_daily_average.png', dpi=300)
+
+def plot_hourly_pattern(agg):
+    """3. Flare Rate by Hour of Day"""
+    start_plot(12, 6)
+    hourly_avg = agg['hourly_avg']
+    plt.bar(hourly_avg.index, hourly_avg.values, color='#2ecc71', alpha=0.7, edgecolor='black')
+    plt.title('Average Flare Rate by Hour of Day', fontsize=14, fontweight='bold')
+    plt.xlabel('Hour of Day')
+    plt.ylabel('Avg Flare Rate (m³/hr)')
+    plt.xticks(range(0, 24, 2))
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.savefig('plot3_hourly_pattern.png', dpi=300)
+
+def plot_monthly_totals(agg):
+    """4. Monthly Total Flare Gas"""
+    start_plot(12, 6)
+    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    colors = plt.cm.viridis(np.linspace(0, 1, 12))
+    plt.bar(range(1, 13), agg['monthly_total'].values, color=colors, edgecolor='black')
+    plt.title('Monthly Total Flare Gas', fontsize=14, fontweight='bold')
+    plt.xlabel('Month')
+    plt.ylabel('Total Flare Gas (1000 m³)')
+    plt.xticks(range(1, 13), month_names)
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.savefig('plot4_monthly_totals.png', dpi=300)
+
+def plot_flare_by_cause(agg):
+    """5. Flare Rate by Cause (using individual cause columns)"""
+    start_plot(12, 7)
+    cause_totals = agg['cause_totals']
+    order = np.argsort(cause_totals)  # Ascending, so the largest bar ends up on top
+
+    plt.barh(range(len(order)), cause_totals[order] / 1000, color=CAUSE_COLORS[order], edgecolor='black')
+    plt.yticks(range(len(order)), CAUSE_LABELS[order])
+    plt.title('Total Flare Gas by Cause', fontsize=14, fontweight='bold')
+    plt.xlabel('Total Flare Gas (1000 m³)')
+    plt.grid(True, alpha=0.3, axis='x')
+    plt.savefig('plot5_flare_by_cause.png', dpi=300)
+
+def plot_stacked_causes(agg):
+    """6. Stacked Area Chart showing contribution by cause over time"""
+    start_plot(15, 7)
+    # Daily totals for cleaner visualization
+    daily_data = agg['daily'][CAUSE_COLUMNS]
+
+    plt.stackplot(daily_data.index,
+                  daily_data['normal_operations_m3_per_hour'],
+                  daily_data['process_upset_m3_per_hour'],
+                  daily_data['equipment_maintenance_m3_per_hour'],
+                  daily_data['startup_shutdown_m3_per_hour'],
+                  daily_data['emergency_relief_m3_per_hour'],
+                  daily_data['compressor_trip_m3_per_hour'],
+                  daily_data['instrument_failure_m3_per_hour'],
+                  labels=['Normal Operations', 'Process Upset', 'Equipment Maintenance', 'Startup/Shutdown', 'Emergency Relief', 'Compressor Trip', 'Instrument Failure'],
+                  colors=CAUSE_COLORS,
+                  alpha=0.8, rasterized=True)
+
+    plt.title('Daily Flare Gas Contribution by Cause', fontsize=14, fontweight='bold')
+    plt.xlabel('Date')
+    plt.ylabel('Daily Total Flare Gas (m³)')
+    plt.legend(loc='upper left', fontsize=9)
+    plt.grid(True, alpha=0.3)
+    plt.savefig('plot6_stacked_causes.png', dpi=300)
+
+def plot_severity_distribution(agg):
+    """7. BONUS: Severity Distribution"""
+    start_plot(10, 6)
+    plt.bar(SEVERITY_LEVELS, agg['severity_counts'], color=SEVERITY_COLORS, edgecolor='black', alpha=0.8)
+    plt.title('Distribution of Flare Events by Severity', fontsize=14, fontweight='bold')
+    plt.xlabel('Severity Level')
+    plt.ylabel('Number of Hours')
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.savefig('plot7_severity_distribution.png', dpi=300)
+
+def plot_normal_ops_distribution(agg):
+    """8. Histogram with KDE overlay of the normal operations flare rate"""
+    start_plot(12, 6)
+    # Binned once with explicit edges, drawn as plain bars
+    counts, edges = agg['normal_ops_histogram']
+    bin_widths = np.diff(edges)
+    histogram = plt.bar(edges[:-1], counts / counts.sum() / bin_widths, width=bin_widths, align='edge',
+            color='#3498db', alpha=0.6, edgecolor='black', label='Histogram')
+    kde_grid, kde_density = agg['normal_ops_kde']
+    kde_line, = plt.plot(kde_grid, kde_density, color='#e74c3c', linewidth=2, label='KDE')
+
+    plt.title('Distribution of Normal Operations Flare Rate', fontsize=14, fontweight='bold')
+    plt.xlabel('Flare Rate (m³/hr)')
+    plt.ylabel('Density')
+    plt.legend(handles=[histogram, kde_line])
+    plt.grid(True, alpha=0.3, axis='y')
+
+    # Add statistics text box
+    mean, median, std = agg['normal_ops_stats']
+    stats_text = f'Mean: {mean:.1f} m³/hr\nMedian: {median:.1f} m³/hr\nStd Dev: {std:.1f} m³/hr'
+    plt.text(0.98, 0.97, stats_text, transform=plt.gca().transAxes,
+             fontsize=10, verticalalignment='top', horizontalalignment='right',
+             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+
+    plt.savefig('plot8_normal_ops_distribution.png', dpi=300)
+
+PLOTS = [
+    plot_full_year,
+    plot_daily_average,
+    plot_hourly_pattern,
+    plot_monthly_totals,
+    plot_flare_by_cause,
+    plot_stacked_causes,
+    plot_severity_distribution,
+    plot_normal_ops_distribution
+]
+
+def main():
+    """Load the flare data once and render every plot in parallel worker processes"""
+    print("Loading flare gas data...")
+    agg = load_aggregates()
+
+    # Each plot only needs the small aggregate bundle and writes its own PNG
+    with ProcessPoolExecutor() as executor:
+        for future in [executor.submit(plot, agg) for plot in PLOTS]:
+            future.result()
+
+    print("\nAll plots have been generated and saved successfully!")
+    print(f"Total plots created: {len(PLOTS)}")
+
+if __name__ == "__main__":
+    main()